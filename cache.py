@@ -0,0 +1,28 @@
+from cachetools import TTLCache
+
+# Short-lived cache for event list responses, cleared whenever events change.
+# Each worker process has its own copy, so other workers may serve a page
+# that is up to the TTL old after a change.
+events_cache = TTLCache(maxsize=256, ttl=10)
+# Encoded "initial_events" websocket frames, shared by clients asking for the
+# same page at about the same time
+initial_events_cache = TTLCache(maxsize=256, ttl=1)
+
+# Bumped on every invalidation. A page whose query was in flight while events
+# changed may be stale, so it is only stored if the generation it was read
+# under is still current.
+_generation = 0
+
+def events_cache_generation() -> int:
+    """Read before querying and pass to store_if_current afterwards"""
+    return _generation
+
+def store_if_current(cache: TTLCache, key, value, generation: int):
+    if generation == _generation:
+        cache[key] = value
+
+def invalidate_events_cache():
+    global _generation
+    _generation += 1
+    events_cache.clear()
+    initial_events_cache.clear()
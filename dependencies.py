@@ -1,7 +1,12 @@
 from fastapi import Depends, HTTPException, status, WebSocket, WebSocketException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+from sqlalchemy import select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, make_transient_to_detached
+from cachetools import TTLCache
+import hashlib
+import jwt
+from jwt import PyJWTError
 from passlib.context import CryptContext
 from database import get_db, settings
 from models import User
@@ -12,12 +17,41 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Built once instead of on every decode; issued tokens carry no exp claim
+_JWT_ALGORITHMS = [ALGORITHM]
+_JWT_DECODE_OPTIONS = {"require": ["sub"]}
+
+# Argon2 for new hashes; bcrypt stays listed so existing hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1
+)
 security = HTTPBearer()
 
+# Short-lived caches so repeat requests skip JWT verification and the user lookup.
+# Nothing evicts entries early, so a user who is deleted or loses the admin role
+# keeps their access, admin included, for up to 60 seconds (per worker process).
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+_user_cache = TTLCache(maxsize=5000, ttl=60)
+_admin_cache = TTLCache(maxsize=1000, ttl=60)
+
+# Authenticated requests never need the password hash, so don't fetch it
+_current_user_columns = load_only(
+    User.id, User.name, User.email, User.role, User.created_at, User.updated_at,
+    raiseload=True
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """Returns (verified, new_hash); new_hash is set when a legacy bcrypt hash
+    should be replaced with argon2"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -26,18 +60,55 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+def _detached_copy(user: User) -> User:
+    """Copy a loaded user into a detached instance that is safe to cache"""
+    loaded = inspect(user).dict
+    copy = User(**{
+        column.key: loaded[column.key]
+        for column in User.__table__.columns
+        if column.key in loaded
+    })
+    make_transient_to_detached(copy)
+    return copy
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    cached = _user_cache.get(email)
+    if cached is not None:
+        # Attach a copy to this session without querying the database
+        return await db.merge(cached, load=False)
+
+    result = await db.execute(
+        select(User).options(_current_user_columns).where(User.email == email)
+    )
+    user = result.scalar_one_or_none()
+    if user is not None:
+        _user_cache[email] = _detached_copy(user)
+    return user
+
 def verify_token(token: str, credentials_exception):
+    key = _token_key(token)
+    token_data = _token_cache.get(key)
+    if token_data is not None:
+        return token_data
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(
+            token, SECRET_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS
+        )
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        return TokenData(email=email)
-    except JWTError as e:
+        token_data = TokenData(email=email)
+        _token_cache[key] = token_data
+        return token_data
+    except PyJWTError as e:
         print(f"JWT Error: {e}")
         raise credentials_exception
 
-async def get_current_user_ws(token: str, db: Session = Depends(get_db)):
+async def get_current_user_ws(token: str, db: AsyncSession = Depends(get_db)):
     """Get current user from WebSocket token"""
     credentials_exception = WebSocketException(
         code=status.WS_1008_POLICY_VIOLATION,
@@ -48,22 +119,15 @@ async def get_current_user_ws(token: str, db: Session = Depends(get_db)):
         return None
         
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        
-        user = db.query(User).filter(User.email == email).first()
-        if user is None:
-            return None
-            
-        return user
-    except JWTError:
+        token_data = verify_token(token, credentials_exception)
+    except WebSocketException:
         return None
 
+    return await get_user_by_email(db, token_data.email)
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -74,7 +138,7 @@ async def get_current_user(
     try:
         token = credentials.credentials
         token_data = verify_token(token, credentials_exception)
-        user = db.query(User).filter(User.email == token_data.email).first()
+        user = await get_user_by_email(db, token_data.email)
         if user is None:
             raise credentials_exception
         return user
@@ -82,10 +146,26 @@ async def get_current_user(
         print(f"Authentication error: {e}")
         raise credentials_exception
 
-async def get_current_admin_user(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
+async def get_current_admin_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+):
+    # Tokens that recently passed the admin check skip the whole auth chain
+    key = _token_key(credentials.credentials)
+    cached = _admin_cache.get(key)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+
+    current_user = await get_current_user(credentials, db)
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
+    _admin_cache[key] = _detached_copy(current_user)
     return current_user
+
+# Load the argon2 backend and PyJWT's signing path at import time, so the
+# first request after start-up doesn't pay for it
+pwd_context.hash("warmup")
+jwt.encode({"sub": "warmup"}, SECRET_KEY, algorithm=ALGORITHM)
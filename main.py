@@ -2,23 +2,38 @@ from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
+import asyncio
+import os
 import uvicorn
 
-from database import engine, Base
+# uvloop isn't available on Windows; fall back to the stock asyncio loop there
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+if uvloop is not None:
+    # Covers servers that create their loop through the policy instead of
+    # choosing uvloop themselves
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+from database import engine, Base, settings
 from routers import auth, events, admin
 from dependencies import get_current_user
 from models import User
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting up...")
+    # Create database tables
+    if settings.AUTO_CREATE_TABLES:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
     yield
     # Shutdown
     print("Shutting down...")
+    await engine.dispose()
 
 app = FastAPI(
     title="Event Management API",
@@ -44,17 +59,6 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-# WebSocket middleware to handle WebSocket connections
-@app.middleware("http")
-async def websocket_middleware(request, call_next):
-    # Handle WebSocket upgrade requests
-    if "upgrade" in request.headers.get("connection", "").lower():
-        return await call_next(request)
-    
-    # For non-WebSocket requests, proceed as normal
-    response = await call_next(request)
-    return response
-
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 app.include_router(events.router, prefix="/events", tags=["events"])
@@ -69,4 +73,14 @@ async def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One process by default: websocket subscribers and the events cache live
+    # in-process, so extra workers (WEB_CONCURRENCY) only see their own
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop" if uvloop is not None else "asyncio",
+        http="httptools"
+    )
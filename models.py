@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from database import Base
 
@@ -7,12 +7,28 @@ class User(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, nullable=False)  # Unique via ix_users_email_covering
     password = Column(String, nullable=False)
     role = Column(String, nullable=False, default="normal")  # admin or normal
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # The only index on email: enforces uniqueness (and backs signup's
+        # ON CONFLICT (email)) while covering the login and current-user
+        # lookups so they can be index-only scans
+        Index(
+            "ix_users_email_covering",
+            "email",
+            unique=True,
+            postgresql_include=["id", "name", "password", "role", "created_at", "updated_at"]
+        ),
+    )
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
 class Event(Base):
     __tablename__ = "events"
 
@@ -24,3 +40,8 @@ class Event(Base):
     image_url = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Serves the newest-first keyset pagination of the events feed
+        Index("ix_events_created_at_id", created_at.desc(), id.desc()),
+    )
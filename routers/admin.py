@@ -1,45 +1,76 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from typing import Optional
 from database import get_db
+from cache import events_cache, events_cache_generation, store_if_current, invalidate_events_cache
 from models import Event
-from schemas import Event as EventSchema, EventCreate, EventUpdate
+from schemas import Event as EventSchema, EventCreate, EventUpdate, EventPage
 from dependencies import get_current_admin_user
 
 router = APIRouter()
 
-@router.get("/events/", response_model=List[EventSchema])
+# Event queries use raiseload("*") so a relationship added to Event later
+# must be eager-loaded explicitly instead of lazy-loading per row (N+1)
+# while the response is serialized.
+
+@router.get("/events/", response_model=EventPage)
 async def get_admin_events(
-    skip: int = 0,
+    after_id: Optional[int] = None,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_admin_user)
 ):
-    """Get all events (admin only)"""
-    events = db.query(Event).offset(skip).limit(limit).all()
-    return events
+    """Get all events, newest first (admin only)
+
+    Keyset paginated: pass the returned next_cursor as after_id to get the
+    following page, so deep pages cost the same as the first one.
+    """
+    # Validate limit to prevent too large or invalid queries
+    limit = min(100, max(1, limit))
+
+    cache_key = ("admin_events", after_id, limit)
+    page = events_cache.get(cache_key)
+    if page is not None:
+        return page
+
+    generation = events_cache_generation()
+    query = select(Event).options(raiseload("*")).order_by(Event.id.desc()).limit(limit)
+    if after_id is not None:
+        query = query.where(Event.id < after_id)
+    result = await db.execute(query)
+    events = result.scalars().all()
+    next_cursor = events[-1].id if events and len(events) == limit else None
+    page = EventPage(items=events, next_cursor=next_cursor)
+    store_if_current(events_cache, cache_key, page, generation)
+    return page
 
 @router.post("/events/", response_model=EventSchema)
 async def create_event(
     event: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_admin_user)
 ):
     """Create a new event (admin only)"""
     db_event = Event(**event.dict())
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await db.refresh(db_event)
+    invalidate_events_cache()
     return db_event
 
 @router.get("/events/{event_id}", response_model=EventSchema)
 async def get_admin_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_admin_user)
 ):
     """Get a specific event by ID (admin only)"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(
+        select(Event).options(raiseload("*")).where(Event.id == event_id)
+    )
+    event = result.scalar_one_or_none()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,11 +82,14 @@ async def get_admin_event(
 async def update_event(
     event_id: int,
     event_update: EventUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_admin_user)
 ):
     """Update an event (admin only)"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(
+        select(Event).options(raiseload("*")).where(Event.id == event_id)
+    )
+    event = result.scalar_one_or_none()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -67,24 +101,28 @@ async def update_event(
     for field, value in update_data.items():
         setattr(event, field, value)
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
+    invalidate_events_cache()
     return event
 
 @router.delete("/events/{event_id}")
 async def delete_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_admin_user)
 ):
     """Delete an event (admin only)"""
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
+    # Delete directly instead of loading the whole row first
+    result = await db.execute(
+        delete(Event).where(Event.id == event_id).returning(Event.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
     
-    db.delete(event)
-    db.commit()
+    await db.commit()
+    invalidate_events_cache()
     return {"message": "Event deleted successfully"}
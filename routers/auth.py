@@ -1,35 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from models import User
-from schemas import UserLogin, UserSignup, Token, User as UserSchema
-from dependencies import verify_password, get_password_hash, create_access_token, get_current_user
+from schemas import UserLogin, UserSignup, Token, User as UserSchema, UserResponse
+from dependencies import verify_and_update_password, get_password_hash, create_access_token, get_current_user
 
 router = APIRouter()
 
 @router.post("/signup", response_model=Token)
-async def signup(user: UserSignup, db: Session = Depends(get_db)):
+async def signup(user: UserSignup, db: AsyncSession = Depends(get_db)):
     try:
-        # Check if user already exists
-        db_user = db.query(User).filter(User.email == user.email).first()
-        if db_user:
-            db.close()  # Explicitly close the session on early return
+        # Hashing is CPU-bound, keep it off the event loop
+        hashed_password = await run_in_threadpool(get_password_hash, user.password)
+
+        # Insert in a single round trip; the unique email index rejects duplicates
+        result = await db.execute(
+            insert(User)
+            .values(
+                name=user.name,
+                email=user.email,
+                password=hashed_password,
+                role=user.role
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
+        )
+        db_user = result.scalar_one_or_none()
+        if db_user is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-        
-        # Create new user
-        hashed_password = get_password_hash(user.password)
-        db_user = User(
-            name=user.name,
-            email=user.email,
-            password=hashed_password,
-            role=user.role
-        )
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
         
         # Create access token
         access_token = create_access_token(data={"sub": user.email})
@@ -43,29 +48,45 @@ async def signup(user: UserSignup, db: Session = Depends(get_db)):
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating user: {str(e)}"
         )
-    finally:
-        db.close()
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     try:
         # Authenticate user
-        user = db.query(User).filter(User.email == user_credentials.email).first()
+        result = await db.execute(select(User).where(User.email == user_credentials.email))
+        user = result.scalar_one_or_none()
         
-        if not user or not verify_password(user_credentials.password, user.password):
-            db.close()  # Close session on early return
+        verified, new_hash = False, None
+        if user:
+            verified, new_hash = await run_in_threadpool(
+                verify_and_update_password, user_credentials.password, user.password
+            )
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        # Rehash legacy bcrypt passwords with argon2 now that we have the plaintext
+        if new_hash:
+            # Statement-level update so the loaded user isn't expired mid-response
+            await db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(password=new_hash)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        
         # Create access token
         access_token = create_access_token(data={"sub": user.email})
         
@@ -78,25 +99,20 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error during login: {str(e)}"
         )
-    finally:
-        db.close()
 
-@router.get("/me")
-async def read_users_me(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+@router.get("/me", response_model=UserResponse)
+async def read_users_me(current_user: User = Depends(get_current_user)):
     """
     Get current user information
     """
     try:
-        # Refresh the user from the database to get the latest data
-        db.refresh(current_user)
         return {
             "user": UserSchema.model_validate(current_user)
         }
@@ -105,5 +121,3 @@ async def read_users_me(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving user data: {str(e)}"
         )
-    finally:
-        db.close()
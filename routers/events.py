@@ -1,139 +1,306 @@
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, WebSocketException, Response
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Set
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Response
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, Optional, Set, Tuple
 import json
 import asyncio
+import itertools
+import orjson
 import logging
-from datetime import datetime
-from database import get_db
-from models import Event, User
-from schemas import Event as EventSchema, EventCreate, EventUpdate
-from dependencies import get_current_user, get_current_user_ws, SECRET_KEY, ALGORITHM
+import operator
+import base64
+from datetime import datetime, timezone
+from database import get_db, SessionLocal
+from cache import initial_events_cache, events_cache_generation, store_if_current, invalidate_events_cache
+from models import Event
+from schemas import Event as EventSchema, EventCreate, EventUpdate, EventFeedPage
+from dependencies import get_current_user, get_current_user_ws, get_current_admin_user
 from sqlalchemy.orm.attributes import flag_modified
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Frames buffered per client before it is treated as too slow and dropped
+OUTBOUND_QUEUE_SIZE = 64
+# Sends in flight at once across all clients, and how long one send may take
+MAX_CONCURRENT_SENDS = 128
+SEND_TIMEOUT = 5.0
+# Batching clients get up to this many frames per send, gathered for at most
+# BATCH_WINDOW seconds
+MAX_BATCH_FRAMES = 16
+BATCH_WINDOW = 0.005
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+        # client_id -> (websocket, outbound frame queue)
+        self.active_connections: Dict[str, Tuple[WebSocket, asyncio.Queue]] = {}
+        self.writers: Dict[str, asyncio.Task] = {}
+        # Immutable (client_id, queue) pairs for broadcasts to iterate;
+        # replaced, never mutated, under the lock on connect and disconnect
+        self._snapshot: Tuple[Tuple[str, asyncio.Queue], ...] = ()
         self.lock = asyncio.Lock()
+        self._send_sem = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        self._closing: Set[asyncio.Task] = set()
     
-    async def connect(self, websocket: WebSocket, client_id: str):
+    async def connect(self, websocket: WebSocket, client_id: str, batch: bool = False):
+        await websocket.accept()
+        queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
         async with self.lock:
-            await websocket.accept()
-            self.active_connections[client_id] = websocket
+            self.active_connections[client_id] = (websocket, queue)
+            self.writers[client_id] = asyncio.create_task(
+                self._writer(client_id, websocket, queue, batch)
+            )
+            self._rebuild_snapshot()
             logger.info(f"Client {client_id} connected. Total connections: {len(self.active_connections)}")
     
-    def disconnect(self, client_id: str):
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
-            logger.info(f"Client {client_id} disconnected. Total connections: {len(self.active_connections)}")
+    async def disconnect(self, client_id: str) -> Optional[WebSocket]:
+        """Forget a client and stop its writer; returns its socket if it was still connected"""
+        async with self.lock:
+            writer = self.writers.pop(client_id, None)
+            entry = self.active_connections.pop(client_id, None)
+            if entry is not None:
+                self._rebuild_snapshot()
+                logger.info(f"Client {client_id} disconnected. Total connections: {len(self.active_connections)}")
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+        return entry[0] if entry is not None else None
     
-    async def send_message(self, message: dict, client_id: str):
-        if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
+    def _rebuild_snapshot(self):
+        self._snapshot = tuple(
+            (client_id, queue) for client_id, (_, queue) in self.active_connections.items()
+        )
+    
+    async def _writer(self, client_id: str, websocket: WebSocket, queue: asyncio.Queue, batch: bool):
+        """Send a client's queued frames in order, one long-lived task per client"""
+        try:
+            while True:
+                if batch:
+                    payload = await self._next_batch(queue)
+                else:
+                    payload = await queue.get()
+                # Bound how many frames are buffered in flight on large fan-outs
+                async with self._send_sem:
+                    await asyncio.wait_for(websocket.send_text(payload), timeout=SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"Send to {client_id} timed out, disconnecting")
+            await self.disconnect(client_id)
+            await self._close(websocket, status.WS_1013_TRY_AGAIN_LATER)
+        except Exception as e:
+            logger.error(f"Error sending message to {client_id}: {str(e)}")
+            await self.disconnect(client_id)
+    
+    async def _next_batch(self, queue: asyncio.Queue) -> str:
+        """Merge queued frames into one JSON array frame to cut per-send overhead"""
+        frames = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BATCH_WINDOW
+        while len(frames) < MAX_BATCH_FRAMES:
             try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending message to {client_id}: {str(e)}")
-                self.disconnect(client_id)
+                frames.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    frames.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+        return "[" + ",".join(frames) + "]"
+    
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception as e:
+            logger.error(f"Error closing WebSocket: {e}")
+    
+    def _enqueue(self, client_id: str, queue: asyncio.Queue, payload: str) -> bool:
+        """Queue a frame without awaiting; False means the client's queue is full"""
+        try:
+            queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Outbound queue full for {client_id}, disconnecting")
+            return False
+    
+    async def _drop_slow(self, client_id: str):
+        # The client can't keep up; drop it so it reconnects and resyncs. The
+        # close frame is sent in the background so the caller isn't held up.
+        websocket = await self.disconnect(client_id)
+        if websocket is not None:
+            task = asyncio.create_task(
+                self._close(websocket, status.WS_1013_TRY_AGAIN_LATER)
+            )
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+    
+    async def send_payload(self, payload: str, client_id: str):
+        """Send an already encoded JSON frame to one client"""
+        entry = self.active_connections.get(client_id)
+        if entry is not None and not self._enqueue(client_id, entry[1], payload):
+            await self._drop_slow(client_id)
+    
+    async def send_message(self, message: dict, client_id: str):
+        await self.send_payload(orjson.dumps(message).decode(), client_id)
+    
+    def has_subscribers(self) -> bool:
+        """Lets callers skip building a broadcast nobody would receive"""
+        return bool(self._snapshot)
     
     async def broadcast(self, message: dict, exclude: Set[str] = None):
+        if not self._snapshot:
+            return
+        await self.broadcast_payload(orjson.dumps(message).decode(), exclude)
+    
+    async def broadcast_payload(self, payload: str, exclude: Set[str] = None):
+        """Queue one already encoded JSON frame for every connection"""
+        if not self._snapshot:
+            return
         if exclude is None:
-            exclude = set()
-        
-        tasks = []
-        async with self.lock:
-            for client_id, websocket in self.active_connections.items():
-                if client_id not in exclude:
-                    try:
-                        tasks.append(websocket.send_json(message))
-                    except Exception as e:
-                        logger.error(f"Error broadcasting to {client_id}: {str(e)}")
-                        self.disconnect(client_id)
+            exclude = ()
         
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        # Every queue holds a reference to the same string. Queuing never
+        # awaits, so this loop can't interleave with connect or disconnect and
+        # doesn't need the lock; the snapshot saves copying the dict per
+        # event and the writer tasks do the sending.
+        slow = [
+            client_id for client_id, queue in self._snapshot
+            if client_id not in exclude and not self._enqueue(client_id, queue, payload)
+        ]
+        for client_id in slow:
+            await self._drop_slow(client_id)
+
+_event_fields = operator.attrgetter(
+    "id", "title", "description", "image_url", "date", "time", "created_at", "updated_at"
+)
+# The same columns, for listings that skip building ORM instances
+_event_columns = (
+    Event.id, Event.title, Event.description, Event.image_url,
+    Event.date, Event.time, Event.created_at, Event.updated_at
+)
+
+def _event_to_dict(event) -> dict:
+    """Plain dict of an event's columns, from an Event or a row of _event_columns;
+    orjson encodes the datetimes itself"""
+    id_, title, description, image_url, date, time, created_at, updated_at = _event_fields(event)
+    return {
+        "id": id_,
+        "title": title,
+        "description": description,
+        "image_url": image_url,
+        "date": date,
+        "time": time,
+        "created_at": created_at,
+        "updated_at": updated_at
+    }
 
 # Create a global connection manager
 manager = ConnectionManager()
 
+# Suffix that keeps client ids unique across one user's connections
+_client_seq = itertools.count()
+
 router = APIRouter()
 
-@router.get("/", response_model=List[EventSchema])
+def _encode_cursor(created_at: datetime, event_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{event_id}".encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for anything that isn't a cursor we handed out"""
+    created_at, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+    return datetime.fromisoformat(created_at), int(event_id)
+
+async def _fetch_events(db: AsyncSession, cursor: Optional[str], limit: int):
+    """Newest events first, shared by the REST and websocket listings
+
+    Keyset paginated on (created_at, id) so every page is a bounded index
+    range scan, however deep. Returns the events and the cursor for the
+    next page (None on the last page). Events come back as plain rows of
+    _event_columns, not ORM instances.
+    """
+    query = (
+        select(*_event_columns)
+        .order_by(Event.created_at.desc(), Event.id.desc())
+        .limit(limit)
+    )
+    if cursor is not None:
+        query = query.where(tuple_(Event.created_at, Event.id) < _decode_cursor(cursor))
+    result = await db.execute(query)
+    events = result.all()
+    next_cursor = None
+    if events and len(events) == limit:
+        next_cursor = _encode_cursor(events[-1].created_at, events[-1].id)
+    return events, next_cursor
+
+@router.get("/", response_model=None, responses={200: {"model": EventFeedPage}})
 async def get_events(
-    skip: int = 0,
+    cursor: Optional[str] = None,
     limit: int = 10,  # Reduced default limit
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
-    Get paginated list of events
-    - skip: Number of records to skip
+    Get paginated list of events, newest first
+    - cursor: next_cursor from the previous page, omit for the first page
     - limit: Maximum number of records to return (max 100)
     """
     # Validate limit to prevent too large queries
     limit = min(100, max(1, limit))
     
-    # Use selectinload for any relationships if they exist
-    # This is more efficient than joinedload for read-heavy operations
-    query = db.query(Event).order_by(Event.created_at.desc())
-    
-    # Apply pagination
-    events = query.offset(skip).limit(limit).all()
-    
-    return events
+    try:
+        events, next_cursor = await _fetch_events(db, cursor, limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    # Rows were read straight from the table, so encode them without
+    # another validation pass
+    return Response(
+        content=orjson.dumps({
+            "items": [_event_to_dict(event) for event in events],
+            "next_cursor": next_cursor
+        }),
+        media_type="application/json"
+    )
 
 
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
     token: str = None,
-    db: Session = Depends(get_db)
+    batch: bool = False
 ):
     """WebSocket endpoint for real-time event updates
     
     Args:
         websocket: The WebSocket connection
         token: JWT token for authentication (required)
+        batch: Send frames as JSON arrays of up to MAX_BATCH_FRAMES messages
+    
+    Connections can stay open for hours, so each database access opens its
+    own short-lived session instead of pinning a pooled connection for the
+    lifetime of the socket.
     """
     if not token:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
     
     try:
-        # Authenticate the user
-        from jose import JWTError, jwt
-        
-        try:
-            # Verify the token
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            username: str = payload.get("sub")
-            if not username:
-                raise WebSocketException(
-                    code=status.WS_1008_POLICY_VIOLATION,
-                    reason="Invalid token: No username in token"
-                )
-            
-            # Get user from database
-            user = db.query(User).filter(User.email == username).first()
-            if not user:
-                raise WebSocketException(
-                    code=status.WS_1008_POLICY_VIOLATION,
-                    reason="User not found"
-                )
-        except JWTError as e:
-            logger.error(f"JWT validation failed: {str(e)}")
+        # Authenticate the user through the cached token and user lookups
+        async with SessionLocal() as db:
+            user = await get_current_user_ws(token, db)
+        if not user:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
         
         # Generate a unique client ID
-        client_id = f"{user.id}_{int(datetime.utcnow().timestamp() * 1000)}"
+        client_id = f"{user.id}_{next(_client_seq)}"
         
         # Add the connection to the manager
-        await manager.connect(websocket, client_id)
+        await manager.connect(websocket, client_id, batch)
         
         try:
             # Send initial connection confirmation
@@ -143,7 +310,7 @@ async def websocket_endpoint(
                 "user": {
                     "id": user.id,
                     "email": user.email,
-                    "is_admin": getattr(user, 'is_admin', False)
+                    "is_admin": user.is_admin
                 },
                 "timestamp": datetime.utcnow().isoformat()
             }, client_id)
@@ -152,46 +319,63 @@ async def websocket_endpoint(
             while True:
                 try:
                     # Wait for a message from the client with a timeout
-                    data = await asyncio.wait_for(
-                        websocket.receive_json(),
+                    message = await asyncio.wait_for(
+                        websocket.receive(),
                         timeout=300  # 5 minutes timeout
                     )
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    
+                    # Decode text and binary frames with orjson directly
+                    data = orjson.loads(message.get("bytes") or message.get("text"))
                     
                     # Handle different message types
                     if data.get("type") == "ping":
                         await manager.send_message({"type": "pong"}, client_id)
                     elif data.get("type") == "get_events":
                         # Get the latest events
-                        skip = data.get("skip", 0)
-                        limit = min(50, data.get("limit", 10))  # Max 50 events
-                        
-                        # Query the database for events
-                        events = db.query(Event).order_by(Event.created_at.desc()).offset(skip).limit(limit).all()
+                        cursor = data.get("cursor")
+                        if cursor is not None and not isinstance(cursor, str):
+                            await manager.send_message({
+                                "type": "error",
+                                "message": "Invalid cursor"
+                            }, client_id)
+                            continue
+                        try:
+                            limit = max(1, min(50, int(data.get("limit", 10))))  # Max 50 events
+                        except (TypeError, ValueError):
+                            await manager.send_message({
+                                "type": "error",
+                                "message": "Invalid limit"
+                            }, client_id)
+                            continue
                         
-                        # Convert events to dict and send them
-                        event_dicts = []
-                        for event in events:
-                            event_dict = {
-                                "id": event.id,
-                                "title": event.title,
-                                "description": event.description,
-                                "image_url": event.image_url,
-                            }
-                            # Safely handle date/time serialization
-                            if hasattr(event, 'date') and event.date:
-                                event_dict["date"] = event.date.isoformat() if hasattr(event.date, 'isoformat') else str(event.date)
-                            if hasattr(event, 'time') and event.time:
-                                event_dict["time"] = event.time.isoformat() if hasattr(event.time, 'isoformat') else str(event.time)
-                            if hasattr(event, 'created_at'):
-                                event_dict["created_at"] = event.created_at.isoformat() if hasattr(event.created_at, 'isoformat') else str(event.created_at)
-                            if hasattr(event, 'updated_at'):
-                                event_dict["updated_at"] = event.updated_at.isoformat() if hasattr(event.updated_at, 'isoformat') else str(event.updated_at)
-                            event_dicts.append(event_dict)
+                        # Clients asking for the same page within the cache TTL share
+                        # one query and one encoded payload
+                        cache_key = (cursor, limit)
+                        payload = initial_events_cache.get(cache_key)
+                        if payload is None:
+                            generation = events_cache_generation()
+                            # Query the database for events
+                            try:
+                                async with SessionLocal() as db:
+                                    events, next_cursor = await _fetch_events(db, cursor, limit)
+                            except ValueError:
+                                await manager.send_message({
+                                    "type": "error",
+                                    "message": "Invalid cursor"
+                                }, client_id)
+                                continue
+                            event_dicts = [_event_to_dict(event) for event in events]
+                            
+                            payload = orjson.dumps({
+                                "type": "initial_events",
+                                "events": event_dicts,
+                                "next_cursor": next_cursor
+                            }).decode()
+                            store_if_current(initial_events_cache, cache_key, payload, generation)
                         
-                        await manager.send_message({
-                            "type": "initial_events",
-                            "events": event_dicts
-                        }, client_id)
+                        await manager.send_payload(payload, client_id)
                     
                 except asyncio.TimeoutError:
                     # Send a ping to keep the connection alive
@@ -207,7 +391,7 @@ async def websocket_endpoint(
             logger.error(f"WebSocket error for {client_id}: {str(e)}")
         finally:
             # Clean up the connection
-            manager.disconnect(client_id)
+            await manager.disconnect(client_id)
             
     except WebSocketDisconnect:
         logger.info("Client disconnected during authentication")
@@ -220,79 +404,43 @@ async def websocket_endpoint(
 
 @router.post("/", response_model=EventSchema, status_code=status.HTTP_201_CREATED)
 async def create_event(
-    event_data: dict,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    event_data: EventCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
 ):
     """Create a new event (admin only)"""
-    # Log the incoming request data
-    logger.info(f"Received create event request with data: {event_data}")
-    
-    # Check if user has admin role
-    if current_user.role != 'admin':
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can create events"
-        )
-    
-    # Log all keys in the request data
-    logger.info(f"Request data keys: {list(event_data.keys())}")
-    
-    # Handle both snake_case and camelCase field names
-    image_url = event_data.get('image_url') or event_data.get('imageUrl')
-    logger.info(f"Resolved image_url: {image_url}")
-    if not all([event_data.get('title'), event_data.get('description'), 
-               event_data.get('date'), event_data.get('time'), image_url]):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing required fields"
-        )
+    # Only format the payload when debug logging is actually on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received create event request with data: %r", event_data)
     
     # Create the event in the database
-    db_event = Event(
-        title=event_data['title'],
-        description=event_data['description'],
-        date=event_data['date'],
-        time=event_data['time'],
-        image_url=image_url
-    )
+    db_event = Event(**event_data.model_dump())
     
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await db.refresh(db_event)
+    invalidate_events_cache()
     
-    # Broadcast the new event to all connected clients
-    await manager.broadcast({
-        "type": "event_created",
-        "event": {
-            "id": db_event.id,
-            "title": db_event.title,
-            "description": db_event.description,
-            "date": db_event.date,  # Already a string in YYYY-MM-DD format
-            "time": db_event.time,  # Already a string in HH:MM format
-            "image_url": db_event.image_url,
-            "created_at": db_event.created_at.isoformat(),
-            "updated_at": db_event.updated_at.isoformat() if db_event.updated_at else None
-        },
-        "timestamp": datetime.utcnow().isoformat()
-    })
+    # Broadcast the new event to all connected clients, encoded once
+    if manager.has_subscribers():
+        payload = orjson.dumps({
+            "type": "event_created",
+            "event": _event_to_dict(db_event),
+            "timestamp": datetime.utcnow()
+        }).decode()
+        await manager.broadcast_payload(payload)
     
     return db_event
 
 @router.get("/{event_id}", response_model=EventSchema)
 async def get_event(
-    event_id: str,  # Accept string ID
-    db: Session = Depends(get_db),
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Get a specific event by ID (accepts both string and integer IDs)"""
-    try:
-        # Try to convert to int for database query
-        event_id_int = int(event_id)
-        event = db.query(Event).filter(Event.id == event_id_int).first()
-    except ValueError:
-        # If conversion fails, try with string ID
-        event = db.query(Event).filter(Event.id == event_id).first()
+    """Get a specific event by ID"""
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    event = result.scalar_one_or_none()
     
     if not event:
         raise HTTPException(
@@ -304,102 +452,65 @@ async def get_event(
 @router.put("/{event_id}", response_model=EventSchema)
 async def update_event(
     event_id: int,
-    event_data: dict,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    event_data: EventUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
 ):
     """Update an existing event (admin only)"""
-    # Check if user has admin role
-    if current_user.role != 'admin':
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can update events"
-        )
-    
     # Get the event from the database
-    db_event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    db_event = result.scalar_one_or_none()
     if not db_event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
         
-    # Handle both snake_case and camelCase field names
-    update_data = {}
-    for field in ['title', 'description', 'date', 'time']:
-        if field in event_data:
-            update_data[field] = event_data[field]
-    
-    # Handle image_url/imageUrl specifically
-    if 'image_url' in event_data or 'imageUrl' in event_data:
-        update_data['image_url'] = event_data.get('image_url') or event_data.get('imageUrl')
-    
-    # Store the old values for the broadcast
-    old_event_data = {
-        "id": db_event.id,
-        "title": db_event.title,
-        "description": db_event.description,
-        "date": db_event.date,
-        "time": db_event.time,
-        "image_url": db_event.image_url
-    }
-    
-    # Update the event with the new data
-    for field, value in update_data.items():
-        setattr(db_event, field, value)
+    update_data = event_data.model_dump(exclude_unset=True)
     
-    db_event.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_event)
-    
-    # Convert date/time objects to ISO format strings for JSON serialization
-    def format_datetime(dt):
-        if dt is None:
-            return None
-        if hasattr(dt, 'isoformat'):
-            return dt.isoformat()
-        return str(dt)  # Fallback for string values
-    
-    # Broadcast the updated event to all connected clients
-    await manager.broadcast({
-        "type": "event_updated",
-        "event_id": db_event.id,
-        "old_data": old_event_data,
-        "new_data": {
+    # Store the old values for the broadcast, if anyone is listening
+    notify = manager.has_subscribers()
+    if notify:
+        old_event_data = {
             "id": db_event.id,
             "title": db_event.title,
             "description": db_event.description,
-            "date": format_datetime(db_event.date),
-            "time": format_datetime(db_event.time),
-            "image_url": db_event.image_url,
-            "updated_at": format_datetime(db_event.updated_at)
+            "date": db_event.date,
+            "time": db_event.time,
+            "image_url": db_event.image_url
         }
-    })
+    
+    # Update the event with the new data
+    for field, value in update_data.items():
+        setattr(db_event, field, value)
+    
+    db_event.updated_at = datetime.now(timezone.utc)  # Aware, so asyncpg stores it as UTC on any host
+    await db.commit()
+    await db.refresh(db_event)
+    invalidate_events_cache()
+    
+    # Broadcast the updated event to all connected clients, encoded once
+    if notify:
+        payload = orjson.dumps({
+            "type": "event_updated",
+            "event_id": db_event.id,
+            "old_data": old_event_data,
+            "new_data": _event_to_dict(db_event)
+        }).decode()
+        await manager.broadcast_payload(payload)
     
     return db_event
 
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_event(
-    event_id: str,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
 ):
     """Delete an event (admin only)"""
-    # Check if user has admin role
-    if current_user.role != 'admin':
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admin users can delete events"
-        )
-    
     # Get the event to delete
-    try:
-        # Try to convert to int for database query
-        event_id_int = int(event_id)
-        db_event = db.query(Event).filter(Event.id == event_id_int).first()
-    except ValueError:
-        # If conversion fails, try with string ID
-        db_event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    db_event = result.scalar_one_or_none()
     
     if not db_event:
         raise HTTPException(
@@ -407,30 +518,25 @@ async def delete_event(
             detail=f"Event with id {event_id} not found"
         )
     
-    # Store event data for the broadcast before deletion
-    event_data = {
-        "id": db_event.id,
-        "title": db_event.title,
-        "description": db_event.description,
-        "date": db_event.date.isoformat() if db_event.date else None,
-        "time": db_event.time.isoformat() if db_event.time else None,
-        "image_url": db_event.image_url,
-        "created_by": db_event.created_by,
-        "created_at": db_event.created_at.isoformat(),
-        "updated_at": db_event.updated_at.isoformat() if db_event.updated_at else None
-    }
+    # Store event data for the broadcast before deletion, if anyone is listening
+    notify = manager.has_subscribers()
+    if notify:
+        event_data = _event_to_dict(db_event)
     
     # Delete the event from the database
-    db.delete(db_event)
-    db.commit()
-    
-    # Broadcast deletion to all connected clients
-    await manager.broadcast({
-        "type": "event_deleted",
-        "event_id": event_data["id"],
-        "event_data": event_data,
-        "deleted_by": current_user.id,
-        "timestamp": datetime.utcnow().isoformat()
-    })
+    await db.delete(db_event)
+    await db.commit()
+    invalidate_events_cache()
+    
+    # Broadcast deletion to all connected clients, encoded once
+    if notify:
+        payload = orjson.dumps({
+            "type": "event_deleted",
+            "event_id": event_data["id"],
+            "event_data": event_data,
+            "deleted_by": current_user.id,
+            "timestamp": datetime.utcnow()
+        }).decode()
+        await manager.broadcast_payload(payload)
     
     return Response(status_code=status.HTTP_204_NO_CONTENT)
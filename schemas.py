@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic.alias_generators import to_camel
+from typing import List, Optional
 from datetime import datetime
 
 # User schemas
@@ -19,6 +20,9 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+class UserResponse(BaseModel):
+    user: User
+
 # Event schemas
 class EventBase(BaseModel):
     title: str
@@ -28,7 +32,10 @@ class EventBase(BaseModel):
     image_url: str
 
 class EventCreate(EventBase):
-    pass
+    # Clients send imageUrl; snake_case is still accepted
+    class Config:
+        alias_generator = to_camel
+        populate_by_name = True
 
 class EventUpdate(BaseModel):
     title: Optional[str] = None
@@ -37,6 +44,10 @@ class EventUpdate(BaseModel):
     time: Optional[str] = None
     image_url: Optional[str] = None
 
+    class Config:
+        alias_generator = to_camel
+        populate_by_name = True
+
 class Event(EventBase):
     id: int
     created_at: Optional[datetime] = None
@@ -45,6 +56,14 @@ class Event(EventBase):
     class Config:
         from_attributes = True
 
+class EventPage(BaseModel):
+    items: List[Event]
+    next_cursor: Optional[int] = None  # Pass back as after_id for the next page
+
+class EventFeedPage(BaseModel):
+    items: List[Event]
+    next_cursor: Optional[str] = None  # Pass back as cursor for the next page
+
 # Authentication schemas
 class Token(BaseModel):
     access_token: str
@@ -2,11 +2,17 @@ from typing import Dict, List, Set
 from fastapi import WebSocket
 import json
 import asyncio
+import orjson
+
+# Sends in flight at once per broadcast manager, and how long one send may take
+MAX_CONCURRENT_SENDS = 128
+SEND_TIMEOUT = 5.0
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         self.lock = asyncio.Lock()
+        self._send_sem = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
     
     async def connect(self, channel: str, websocket: WebSocket):
         await websocket.accept()
@@ -15,26 +21,49 @@ class ConnectionManager:
                 self.active_connections[channel] = set()
             self.active_connections[channel].add(websocket)
     
-    def disconnect(self, channel: str, websocket: WebSocket):
-        if channel in self.active_connections:
-            self.active_connections[channel].discard(websocket)
-            if not self.active_connections[channel]:
-                del self.active_connections[channel]
+    async def disconnect(self, channel: str, websocket: WebSocket):
+        async with self.lock:
+            if channel in self.active_connections:
+                self.active_connections[channel].discard(websocket)
+                if not self.active_connections[channel]:
+                    del self.active_connections[channel]
+    
+    async def _safe_send(self, websocket: WebSocket, payload: str) -> bool:
+        async with self._send_sem:
+            try:
+                await asyncio.wait_for(websocket.send_text(payload), timeout=SEND_TIMEOUT)
+                return True
+            except Exception as e:
+                print(f"Error broadcasting to WebSocket: {e}")
+                return False
     
     async def broadcast(self, channel: str, message: dict):
-        if channel in self.active_connections:
-            disconnected = set()
-            for connection in self.active_connections[channel]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"Error broadcasting to WebSocket: {e}")
-                    disconnected.add(connection)
-            
+        if channel not in self.active_connections:
+            return
+        
+        # Snapshot the targets under the lock, then send without holding it so
+        # a slow socket can't block connects, disconnects or other broadcasts
+        async with self.lock:
+            targets = list(self.active_connections.get(channel, ()))
+        if not targets:
+            return
+        
+        # Encode once and send the same text frame to every connection
+        payload = orjson.dumps(message).decode()
+        # At most MAX_CONCURRENT_SENDS frames are in flight at any time
+        results = await asyncio.gather(
+            *(self._safe_send(connection, payload) for connection in targets)
+        )
+        disconnected = {
+            connection for connection, sent in zip(targets, results) if not sent
+        }
+        
+        if disconnected:
             async with self.lock:
-                self.active_connections[channel] -= disconnected
-                if not self.active_connections[channel]:
-                    del self.active_connections[channel]
+                if channel in self.active_connections:
+                    self.active_connections[channel] -= disconnected
+                    if not self.active_connections[channel]:
+                        del self.active_connections[channel]
 
 # Global WebSocket manager instance
 manager = ConnectionManager()